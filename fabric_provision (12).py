@@ -1,12 +1,43 @@
 import argparse
 import csv
+import functools
 import ipaddress
 import os
 import re
+import sys
 import yaml
-from typing import Dict, List, Any, Optional
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Any, Optional, Sequence, Tuple
 from jinja2 import Environment, FileSystemLoader
-from itertools import islice
+from itertools import chain
+
+# Prefer the libyaml C bindings; fall back to the pure-Python implementation
+try:
+    from yaml import CSafeLoader as _Loader, CSafeDumper as _Dumper
+except ImportError:
+    from yaml import SafeLoader as _Loader, SafeDumper as _Dumper
+
+# Precompiled patterns for hostname and port range parsing
+_HOSTNAME_RANGE_RE = re.compile(r"^([^\[]+)\[([0-9a-zA-Z]+)-([0-9a-zA-Z]+)\]$")
+_HOSTNAME_RE = re.compile(r"^[a-zA-Z0-9-]+$")
+_RANGE_LIST_RE = re.compile(r"\d+(?:-\d+)?(?:\s*,\s*\d+(?:-\d+)?)*")
+_RANGE_ITEM_RE = re.compile(r"(\d+)(?:-(\d+))?")
+
+# Fixed-width row layout for the connections table
+_ROW_FMT = "{:<20} | {:<12} | {:<20} | {:<12} | {:<10} | {:<10} | {:<15} | {:<20}"
+
+# Large write buffer for the streamed CSV artifacts so writerows flushes in few syscalls
+_CSV_BUFFER_SIZE = 1 << 20
+
+# Memoized network parser; the same CIDR strings are parsed from several places
+_cached_ip_network = functools.lru_cache(maxsize=4096)(ipaddress.ip_network)
+
+def _ip_network(value: Any, strict: bool = True):
+    """Parse a network, memoizing str/int inputs; other values go to ip_network for its ValueError."""
+    if isinstance(value, (str, int)):
+        return _cached_ip_network(value, strict=strict)
+    return ipaddress.ip_network(value, strict=strict)
 
 # Config Reader Functions
 def read_config(config_path: str, input_path: Optional[str] = None, user_inputs: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -50,7 +81,7 @@ def _read_yaml(file_path: str, file_type: str) -> Dict[str, Any]:
     """Read YAML file."""
     try:
         with open(file_path, 'r') as f:
-            data = yaml.safe_load(f)
+            data = yaml.load(f, Loader=_Loader)
         if not data:
             return {}
         return data
@@ -59,21 +90,30 @@ def _read_yaml(file_path: str, file_type: str) -> Dict[str, Any]:
     except yaml.YAMLError as e:
         raise ValueError(f"Invalid YAML format in {file_type} file: {e}")
 
+def _leaf_pair_enabled(config: Dict[str, Any]) -> bool:
+    """Return whether leaf pairing is enabled in config."""
+    return config.get("leaf_pair") in (True, "yes", "true")
+
 def _validate_config(config: Dict[str, Any]):
     """Validate configuration settings for present keys."""
+    leaf_pair = _leaf_pair_enabled(config)
     # Validate network addresses if provided
     transit_net = None
     loopback_net = None
     if "transit" in config:
         try:
-            transit_net = ipaddress.ip_network(config["transit"], strict=False)
+            transit_net = _ip_network(config["transit"], strict=False)
         except ValueError as e:
             raise ValueError(f"Invalid transit network address: {e}")
+        if transit_net.version != 4:
+            raise ValueError(f"Invalid transit network address: {config['transit']} is not an IPv4 network")
     if "loopback" in config:
         try:
-            loopback_net = ipaddress.ip_network(config["loopback"], strict=False)
+            loopback_net = _ip_network(config["loopback"], strict=False)
         except ValueError as e:
             raise ValueError(f"Invalid loopback network address: {e}")
+        if loopback_net.version != 4:
+            raise ValueError(f"Invalid loopback network address: {config['loopback']} is not an IPv4 network")
     
     # Check for network overlap
     if transit_net and loopback_net and transit_net.overlaps(loopback_net):
@@ -86,7 +126,7 @@ def _validate_config(config: Dict[str, Any]):
         if not isinstance(config["num_of_leafs"], int) or config["num_of_leafs"] < 1:
             raise ValueError("num_of_leafs must be a positive integer")
         # Require even number of leafs only if leaf_pair is true
-        if config.get("leaf_pair") in [True, "yes", "true"] and config["num_of_leafs"] % 2 != 0:
+        if leaf_pair and config["num_of_leafs"] % 2 != 0:
             raise ValueError("num_of_leafs must be even when leaf_pair is enabled")
     if "bgp_asn" in config and (not isinstance(config["bgp_asn"], int) or config["bgp_asn"] < 1):
         raise ValueError("bgp_asn must be a positive integer")
@@ -95,13 +135,13 @@ def _validate_config(config: Dict[str, Any]):
     if "num_of_spines" in config and "num_of_leafs" in config and loopback_net:
         total_devices = config["num_of_spines"] + config["num_of_leafs"]
         # Calculate usable IPs (exclude network and broadcast for non-/31 or /32)
-        usable_ips = sum(1 for _ in loopback_net.hosts()) if loopback_net.prefixlen < 31 else loopback_net.num_addresses
+        usable_ips = loopback_net.num_addresses - 2 if loopback_net.prefixlen < 31 else loopback_net.num_addresses
         if usable_ips < total_devices:
             raise ValueError(f"Loopback network {loopback_net} has only {usable_ips} usable IPs, need {total_devices} for {total_devices} devices")
     
     if "num_of_leafs" in config and transit_net:
         required_subnets = config["num_of_leafs"]
-        if config.get("leaf_pair") in [True, "yes", "true"]:
+        if leaf_pair:
             required_subnets += config["num_of_leafs"] // 2
         # Calculate maximum /31 subnets possible
         max_subnets = transit_net.num_addresses // 2  # Each /31 uses 2 addresses
@@ -109,13 +149,12 @@ def _validate_config(config: Dict[str, Any]):
             raise ValueError(f"Transit network {transit_net} can provide {max_subnets} /31 subnets, need {required_subnets}")
 
     # Parse and validate leaf_spine_ports if provided
+    # (parse_flexible_range returns sorted, de-duplicated ports, so no duplicate checks are needed)
     if "leaf_spine_ports" in config:
         try:
             config["leaf_spine_ports"] = parse_flexible_range(config["leaf_spine_ports"])
             if not config["leaf_spine_ports"]:
                 raise ValueError("leaf_spine_ports must not be empty")
-            if len(set(config["leaf_spine_ports"])) != len(config["leaf_spine_ports"]):
-                raise ValueError("Duplicate port numbers in leaf_spine_ports")
         except ValueError as e:
             raise ValueError(f"Invalid leaf_spine_ports: {e}")
 
@@ -125,46 +164,39 @@ def _validate_config(config: Dict[str, Any]):
             config["inter_leaf_ports"] = parse_flexible_range(config["inter_leaf_ports"])
             if not config["inter_leaf_ports"]:
                 raise ValueError("inter_leaf_ports must not be empty")
-            if len(set(config["inter_leaf_ports"])) != len(config["inter_leaf_ports"]):
-                raise ValueError("Duplicate port numbers in inter_leaf_ports")
         except ValueError as e:
             raise ValueError(f"Invalid inter_leaf_ports: {e}")
 
-    # Parse and validate spine port ranges if provided
-    if "spine_port_channel_range" in config:
+    # Parse and validate spine port ranges if provided, one pass per range
+    for key in ("spine_port_channel_range", "spine_ports_range"):
+        if key not in config:
+            continue
         try:
-            config["spine_port_channel_range"] = parse_flexible_range(config["spine_port_channel_range"])
-            if not config["spine_port_channel_range"]:
-                raise ValueError("spine_port_channel_range must not be empty")
-            if len(set(config["spine_port_channel_range"])) != len(config["spine_port_channel_range"]):
-                raise ValueError("Duplicate port numbers in spine_port_channel_range")
-        except ValueError as e:
-            raise ValueError(f"Invalid spine_port_channel_range: {e}")
-    
-    if "spine_ports_range" in config:
-        try:
-            config["spine_ports_range"] = parse_flexible_range(config["spine_ports_range"])
-            if not config["spine_ports_range"]:
-                raise ValueError("spine_ports_range must not be empty")
-            if len(set(config["spine_ports_range"])) != len(config["spine_ports_range"]):
-                raise ValueError("Duplicate port numbers in spine_ports_range")
+            ports = parse_flexible_range(config[key])
+            config[key] = ports
+            if not ports:
+                raise ValueError(f"{key} must not be empty")
             # Ensure enough ports for leaf connections
-            if "num_of_leafs" in config and "leaf_spine_ports" in config:
-                if len(config["spine_ports_range"]) < config["num_of_leafs"] * len(config["leaf_spine_ports"]):
+            if key == "spine_ports_range" and "num_of_leafs" in config and "leaf_spine_ports" in config:
+                if len(ports) < config["num_of_leafs"] * len(config["leaf_spine_ports"]):
                     raise ValueError("spine_ports_range does not have enough ports for all leaf connections")
         except ValueError as e:
-            raise ValueError(f"Invalid spine_ports_range: {e}")
+            raise ValueError(f"Invalid {key}: {e}")
 
 # Input Validator Functions
 def parse_hostname_range(hostname_input: str) -> List[str]:
     """Parse hostname range (e.g., nj01pamr[101-106], nj01pamr[101a-101c])."""
-    match = re.match(r"^([anian-hostname-range(hostname_input: str) -> List[str]:
-    """Parse hostname range (e.g., nj01pamr[101-106], nj01pamr[101a-101c])."""
-    match = re.match(r"^([^\[]+)\[([0-9a-zA-Z]+)-([0-9a-zA-Z]+)\]$", hostname_input)
-    if not match:
-        raise ValueError(f"Invalid hostname range format: {hostname_input}. Expected format: prefix[start-end]")
-    
-    prefix, start, end = match.groups()
+    # Fast path for the usual prefix[start-end] shape; anything unusual goes through the regex
+    lb = hostname_input.find("[")
+    start, sep, end = hostname_input[lb + 1:-1].partition("-")
+    if (lb > 0 and hostname_input.endswith("]") and sep
+            and start.isascii() and start.isalnum() and end.isascii() and end.isalnum()):
+        prefix = hostname_input[:lb]
+    else:
+        match = _HOSTNAME_RANGE_RE.match(hostname_input)
+        if not match:
+            raise ValueError(f"Invalid hostname range format: {hostname_input}. Expected format: prefix[start-end]")
+        prefix, start, end = match.groups()
     
     if start.isdigit() and end.isdigit():
         start_num, end_num = int(start), int(end)
@@ -204,17 +236,30 @@ def parse_flexible_range(range_input: Any) -> List[int]:
             return []
         
         result = set()
+        # Well-formed lists are parsed by the compiled pattern; anything else takes the
+        # item-by-item path below so it gets a specific error
+        if _RANGE_LIST_RE.fullmatch(range_str):
+            for lo, hi in _RANGE_ITEM_RE.findall(range_str):
+                start = int(lo)
+                end = int(hi) if hi else start
+                if start < 1 or start > end:
+                    break
+                result.update(range(start, end + 1))
+            else:
+                return sorted(result)
+            result.clear()
+        
         items = range_str.split(",")
         
         for item in items:
             item = item.strip()
             if not item:
                 continue
-            if "-" in item:
-                match = re.match(r"^(\d+)-(\d+)$", item)
-                if not match:
+            lo, sep, hi = item.partition("-")
+            if sep:
+                if not (lo.isdigit() and hi.isdigit()):
                     raise ValueError(f"Invalid range format in item: {item}. Expected: start-end")
-                start, end = map(int, match.groups())
+                start, end = int(lo), int(hi)
                 if start < 1 or end < 1:
                     raise ValueError(f"Range values must be positive integers: {item}")
                 if start > end:
@@ -229,7 +274,7 @@ def parse_flexible_range(range_input: Any) -> List[int]:
                 except ValueError as e:
                     raise ValueError(f"Invalid number format in item: {item}. Error: {e}")
         
-        return sorted(list(result))
+        return sorted(result)
     except Exception as e:
         raise ValueError(f"Failed to parse range {range_input}: {e}")
 
@@ -243,47 +288,78 @@ def validate_input(num_spines: int, num_leafs: int, spines: List[str], leafs: Li
         raise ValueError(f"Expected {num_spines} spine hostnames, got {len(spines)}")
     if len(leafs) != num_leafs:
         raise ValueError(f"Expected {num_leafs} leaf hostnames, got {len(leafs)}")
-    if len(set(spines + leafs)) != len(spines + leafs):
-        raise ValueError("Duplicate hostnames detected")
     
-    hostname_pattern = re.compile(r"^[a-zA-Z0-9-]+$")
-    for hostname in spines + leafs:
-        if not hostname_pattern.match(hostname):
+    # Check duplicates and hostname format in a single pass
+    seen = set()
+    for hostname in chain(spines, leafs):
+        if hostname in seen:
+            raise ValueError("Duplicate hostnames detected")
+        seen.add(hostname)
+        if not _HOSTNAME_RE.match(hostname):
             raise ValueError(f"Invalid hostname: {hostname}. Only alphanumeric characters and hyphens allowed")
 
 # IP Utilities Functions
-def generate_subnets(network: str, prefix_len: str) -> List[ipaddress.IPv4Network]:
-    """Generate list of subnets from a network."""
-    net = ipaddress.ip_network(network)
-    return list(net.subnets(new_prefix=int(prefix_len.lstrip('/'))))
+def _subnet_bases(net: ipaddress.IPv4Network, prefix_len: str, count: Optional[int] = None) -> Tuple[range, int]:
+    """Return the integer base address of each subnet and the subnet prefix length."""
+    if net.version != 4:
+        raise ValueError(f"Network {net} is not an IPv4 network")
+    new_prefix = int(prefix_len.lstrip('/'))
+    # Each link subnet must hold both ends; a /32 would put the peer in the next subnet
+    if not net.prefixlen <= new_prefix < net.max_prefixlen:
+        raise ValueError(f"Invalid subnet prefix {prefix_len} for network {net}")
+    # Subnets are evenly strided, so their bases form a plain integer range
+    stride = 1 << (net.max_prefixlen - new_prefix)
+    available = net.num_addresses // stride
+    base = int(net.network_address)
+    total = available if count is None else min(count, available)
+    return range(base, base + total * stride, stride), new_prefix
+
+def _ip_str(n: int) -> str:
+    """Format an integer IPv4 address as a dotted-quad string."""
+    return f"{(n >> 24) & 0xFF}.{(n >> 16) & 0xFF}.{(n >> 8) & 0xFF}.{n & 0xFF}"
 
-def generate_ips(network: str, start: int, count: int) -> List[str]:
+def generate_ips(net: ipaddress.IPv4Network, start: int, count: int) -> List[str]:
     """Generate list of IPs from a network starting at offset."""
-    net = ipaddress.ip_network(network)
-    return [str(ip) for ip in list(net)[start:start + count]]
+    if net.version != 4:
+        raise ValueError(f"Network {net} is not an IPv4 network")
+    base = int(net.network_address)
+    return [_ip_str(base + i) for i in range(start, min(start + count, net.num_addresses))]
 
 def assign_ips(devices: Dict[str, List[Dict]], num_leafs: int, config: Dict[str, Any]) -> None:
     """Assign IPs without state persistence."""
     # Minimal defaults for IP assignment
-    transit_network = config.get("transit", "10.10.10.0/24")
-    loopback_network = config.get("loopback", "10.10.20.0/24")
+    transit_network = _ip_network(config.get("transit", "10.10.10.0/24"))
+    loopback_network = _ip_network(config.get("loopback", "10.10.20.0/24"))
     leaf_spine_linknet = config.get("leaf_spine_linknet", "/31")
     inter_leaf_linknet = config.get("inter_leaf_linknet", "/31")
-    
-    transit_subnets = generate_subnets(transit_network, leaf_spine_linknet)
+    bgp_asn = config.get("bgp_asn", 65000)
+    leaf_pair = _leaf_pair_enabled(config)
+    
+    # Only build the subnets that are handed out: one per leaf plus one per leaf pair
+    needed_subnets = num_leafs
+    if leaf_pair:
+        needed_subnets += num_leafs // 2
+    # Work on integer subnet bases; only the strings that are stored get formatted
+    transit_bases, transit_prefix = _subnet_bases(transit_network, leaf_spine_linknet, needed_subnets)
+    if len(transit_bases) < needed_subnets:
+        raise ValueError(f"Transit network {transit_network} cannot provide {needed_subnets} {leaf_spine_linknet} subnets")
     
     # Assign continuous loopback IPs for all devices
     total_devices = len(devices["spines"]) + len(devices["leafs"])
     loopback_ips = generate_ips(loopback_network, 1, total_devices)
+    if len(loopback_ips) < total_devices:
+        raise ValueError(f"Loopback network {loopback_network} cannot provide {total_devices} loopback IPs")
     
-    ip_index = 0
-    for spine in devices["spines"]:
-        spine["loopback_ip"] = f"{loopback_ips[ip_index]}/32"
-        ip_index += 1
+    # Keep the bare address alongside the /32 form so consumers never re-split it
+    for device, loopback_addr in zip(chain(devices["spines"], devices["leafs"]), loopback_ips):
+        device["loopback_addr"] = loopback_addr
+        device["loopback_ip"] = f"{loopback_addr}/32"
     
-    for leaf in devices["leafs"]:
-        leaf["loopback_ip"] = f"{loopback_ips[ip_index]}/32"
-        ip_index += 1
+    # Every leaf peers with the same spines, so build the neighbor list once
+    bgp_neighbors = [
+        {"hostname": spine["hostname"], "neighbor_ip": spine["loopback_addr"], "remote_asn": bgp_asn}
+        for spine in devices["spines"]
+    ]
     
     # Assign leaf-spine transit IPs
     transit_index = 0
@@ -292,39 +368,38 @@ def assign_ips(devices: Dict[str, List[Dict]], num_leafs: int, config: Dict[str,
         spine_idx = 0 if is_odd_leaf else 1
         spine = devices["spines"][spine_idx]
         
-        transit_net = transit_subnets[transit_index]
-        transit_ips = [str(ip) for ip in islice(transit_net, 2)]
+        transit_base = transit_bases[transit_index]
+        transit_ips = (_ip_str(transit_base), _ip_str(transit_base + 1))
+        transit_subnet = f"{transit_ips[0]}/{transit_prefix}"
         
-        leaf_ints = [intf for intf in leaf["interfaces"] if intf["peer"] == spine["hostname"]]
-        spine_ints = [intf for intf in spine["interfaces"] if intf["peer"] == leaf["hostname"]]
+        leaf_ints = leaf["_by_peer"][spine["hostname"]]
+        spine_ints = spine["_by_peer"][leaf["hostname"]]
         for leaf_int in leaf_ints:
-            leaf_int.update({"ip": f"{transit_ips[0]}/31", "transit_subnet": str(transit_net)})
+            leaf_int.update({"ip": f"{transit_ips[0]}/31", "transit_subnet": transit_subnet})
         for spine_int in spine_ints:
-            spine_int.update({"ip": f"{transit_ips[1]}/31", "transit_subnet": str(transit_net)})
+            spine_int.update({"ip": f"{transit_ips[1]}/31", "transit_subnet": transit_subnet})
         
-        leaf["bgp_neighbors"] = [
-            {"hostname": spine["hostname"], "neighbor_ip": spine["loopback_ip"].split("/")[0], "remote_asn": config.get("bgp_asn", 65000)}
-            for spine in devices["spines"]
-        ]
+        leaf["bgp_neighbors"] = list(bgp_neighbors)
         transit_index += 1
     
     # Assign inter-leaf IPs if leaf_pair is enabled
-    if config.get("leaf_pair") in [True, "yes", "true"]:
-        inter_leaf_subnets = list(islice(transit_subnets, num_leafs, num_leafs + (num_leafs // 2)))
+    if leaf_pair:
+        inter_leaf_bases = transit_bases[num_leafs:num_leafs + (num_leafs // 2)]
         inter_leaf_index = 0
         for pair_idx in range(0, num_leafs, 2):
             leaf1 = devices["leafs"][pair_idx]
             leaf2 = devices["leafs"][pair_idx + 1]
             
-            inter_leaf_net = inter_leaf_subnets[inter_leaf_index]
-            inter_leaf_ips = [str(ip) for ip in islice(inter_leaf_net, 2)]
+            inter_leaf_base = inter_leaf_bases[inter_leaf_index]
+            inter_leaf_ips = (_ip_str(inter_leaf_base), _ip_str(inter_leaf_base + 1))
+            inter_leaf_subnet = f"{inter_leaf_ips[0]}/{transit_prefix}"
             
-            leaf1_ints = [intf for intf in leaf1["interfaces"] if intf["peer"] == leaf2["hostname"]]
-            leaf2_ints = [intf for intf in leaf2["interfaces"] if intf["peer"] == leaf1["hostname"]]
+            leaf1_ints = leaf1["_by_peer"][leaf2["hostname"]]
+            leaf2_ints = leaf2["_by_peer"][leaf1["hostname"]]
             for leaf1_int in leaf1_ints:
-                leaf1_int.update({"ip": f"{inter_leaf_ips[0]}/31", "transit_subnet": str(inter_leaf_net)})
+                leaf1_int.update({"ip": f"{inter_leaf_ips[0]}/31", "transit_subnet": inter_leaf_subnet})
             for leaf2_int in leaf2_ints:
-                leaf2_int.update({"ip": f"{inter_leaf_ips[1]}/31", "transit_subnet": str(inter_leaf_net)})
+                leaf2_int.update({"ip": f"{inter_leaf_ips[1]}/31", "transit_subnet": inter_leaf_subnet})
             inter_leaf_index += 1
 
 # Device Manager Functions
@@ -332,24 +407,30 @@ def initialize_devices(num_spines: int, num_leafs: int, spines: List[str], leafs
                       config: Dict[str, Any]) -> Dict[str, List[Dict]]:
     """Initialize spine and leaf devices."""
     devices = {"spines": [], "leafs": []}
+    leaf_pair = _leaf_pair_enabled(config)
+    bgp_asn = config.get("bgp_asn", 65000)
     for i, hostname in enumerate(spines[:num_spines]):
         devices["spines"].append({
             "hostname": hostname,
             "role": "spine",
             "interfaces": [],
-            "bgp_asn": config.get("bgp_asn", 65000),
+            "_by_peer": defaultdict(list),
+            "bgp_asn": bgp_asn,
             "loopback_ip": None,
+            "loopback_addr": None,
             "bgp_neighbors": []
         })
     for i, hostname in enumerate(leafs[:num_leafs]):
-        pair_id = (i // 2) + 1 if config.get("leaf_pair") in [True, "yes", "true"] else None
+        pair_id = (i // 2) + 1 if leaf_pair else None
         devices["leafs"].append({
             "hostname": hostname,
             "role": "leaf",
             "interfaces": [],
-            "bgp_asn": config.get("bgp_asn", 65000),
+            "_by_peer": defaultdict(list),
+            "bgp_asn": bgp_asn,
             "pair_id": pair_id,
             "loopback_ip": None,
+            "loopback_addr": None,
             "bgp_neighbors": []
         })
     return devices
@@ -360,90 +441,197 @@ def build_connectivity(devices: Dict[str, List[Dict]], num_leafs: int, config: D
     leaf_spine_ports = config.get("leaf_spine_ports", [47, 48])
     spine_ports_range = config.get("spine_ports_range", list(range(1, num_leafs * len(leaf_spine_ports) + 1)))
     
+    num_ports = len(leaf_spine_ports)
+    # Leaf and spine use the same port-channel ID, so the name is loop-invariant
+    spine_po_id = config.get("leaf_spine_port_channel_id", 1)
+    spine_po_name = f"Port-Channel{spine_po_id}"
+    # Every leaf uses the same uplink ports, so format their names once
+    leaf_port_names = [(leaf_port_num, f"Ethernet{leaf_port_num}") for leaf_port_num in leaf_spine_ports]
+    
     spine_port_index = 0
     for leaf_idx, leaf in enumerate(devices["leafs"]):
         is_odd_leaf = leaf_idx % 2 == 0
         spine_idx = 0 if is_odd_leaf else 1
         spine = devices["spines"][spine_idx]
-        local_po = config.get("leaf_spine_port_channel_id", 1)
-        remote_po = config.get("leaf_spine_port_channel_id", 1)
+        leaf_hostname = leaf["hostname"]
+        spine_hostname = spine["hostname"]
+        leaf_interfaces = leaf["interfaces"]
+        spine_interfaces = spine["interfaces"]
+        leaf_to_spine = leaf["_by_peer"][spine_hostname]
+        spine_to_leaf = spine["_by_peer"][leaf_hostname]
         
-        for port_idx, leaf_port_num in enumerate(leaf_spine_ports):
-            leaf_port = f"Ethernet{leaf_port_num}"
-            spine_port_num = spine_ports_range[spine_port_index + port_idx]
+        spine_slice = spine_ports_range[spine_port_index:spine_port_index + num_ports]
+        if len(spine_slice) < num_ports:
+            raise ValueError("spine_ports_range does not have enough ports for all leaf connections")
+        for (leaf_port_num, leaf_port), spine_port_num in zip(leaf_port_names, spine_slice):
             spine_port = f"Ethernet{spine_port_num}"
-            leaf["interfaces"].append({
-                "name": f"Port-Channel{local_po}",
-                "peer": spine["hostname"],
-                "peer_int": f"Port-Channel{remote_po}",
+            leaf_intf = {
+                "name": spine_po_name,
+                "peer": spine_hostname,
+                "peer_int": spine_po_name,
                 "type": "port-channel",
                 "physical_interface": leaf_port,
-                "spine_physical_interface": spine_port
-            })
-            spine["interfaces"].append({
-                "name": f"Port-Channel{remote_po}",
-                "peer": leaf["hostname"],
-                "peer_int": f"Port-Channel{local_po}",
+                "spine_physical_interface": spine_port,
+                "port_num": leaf_port_num,
+                "peer_port_num": spine_port_num,
+                "po_id": spine_po_id,
+                "peer_po_id": spine_po_id
+            }
+            spine_intf = {
+                "name": spine_po_name,
+                "peer": leaf_hostname,
+                "peer_int": spine_po_name,
                 "type": "port-channel",
                 "physical_interface": spine_port,
-                "leaf_physical_interface": leaf_port
-            })
-        spine_port_index += len(leaf_spine_ports)
+                "leaf_physical_interface": leaf_port,
+                "port_num": spine_port_num,
+                "peer_port_num": leaf_port_num,
+                "po_id": spine_po_id,
+                "peer_po_id": spine_po_id
+            }
+            leaf_interfaces.append(leaf_intf)
+            leaf_to_spine.append(leaf_intf)
+            spine_interfaces.append(spine_intf)
+            spine_to_leaf.append(spine_intf)
+        spine_port_index += num_ports
     
-    if config.get("leaf_pair") in [True, "yes", "true"]:
+    if _leaf_pair_enabled(config):
         inter_leaf_ports = config.get("inter_leaf_ports", [51, 52])
-        inter_leaf_po = config.get("inter_leaf_port_channel_id", 600)
+        inter_leaf_po_id = config.get("inter_leaf_port_channel_id", 600)
+        inter_leaf_po_name = f"Port-Channel{inter_leaf_po_id}"
+        inter_leaf_port_names = [(leaf_port_num, f"Ethernet{leaf_port_num}") for leaf_port_num in inter_leaf_ports]
         for pair_idx in range(0, num_leafs, 2):
             leaf1 = devices["leafs"][pair_idx]
             leaf2 = devices["leafs"][pair_idx + 1]
-            for port_idx, leaf_port_num in enumerate(inter_leaf_ports):
-                leaf_port = f"Ethernet{leaf_port_num}"
-                leaf1["interfaces"].append({
-                    "name": f"Port-Channel{inter_leaf_po}",
-                    "peer": leaf2["hostname"],
-                    "peer_int": f"Port-Channel{inter_leaf_po}",
+            leaf1_hostname = leaf1["hostname"]
+            leaf2_hostname = leaf2["hostname"]
+            leaf1_to_leaf2 = leaf1["_by_peer"][leaf2_hostname]
+            leaf2_to_leaf1 = leaf2["_by_peer"][leaf1_hostname]
+            for leaf_port_num, leaf_port in inter_leaf_port_names:
+                leaf1_intf = {
+                    "name": inter_leaf_po_name,
+                    "peer": leaf2_hostname,
+                    "peer_int": inter_leaf_po_name,
                     "type": "port-channel",
                     "physical_interface": leaf_port,
-                    "peer_physical_interface": leaf_port
-                })
-                leaf2["interfaces"].append({
-                    "name": f"Port-Channel{inter_leaf_po}",
-                    "peer": leaf1["hostname"],
-                    "peer_int": f"Port-Channel{inter_leaf_po}",
+                    "peer_physical_interface": leaf_port,
+                    "port_num": leaf_port_num,
+                    "peer_port_num": leaf_port_num,
+                    "po_id": inter_leaf_po_id,
+                    "peer_po_id": inter_leaf_po_id
+                }
+                leaf2_intf = {
+                    "name": inter_leaf_po_name,
+                    "peer": leaf1_hostname,
+                    "peer_int": inter_leaf_po_name,
                     "type": "port-channel",
                     "physical_interface": leaf_port,
-                    "peer_physical_interface": leaf_port
-                })
+                    "peer_physical_interface": leaf_port,
+                    "port_num": leaf_port_num,
+                    "peer_port_num": leaf_port_num,
+                    "po_id": inter_leaf_po_id,
+                    "peer_po_id": inter_leaf_po_id
+                }
+                leaf1["interfaces"].append(leaf1_intf)
+                leaf1_to_leaf2.append(leaf1_intf)
+                leaf2["interfaces"].append(leaf2_intf)
+                leaf2_to_leaf1.append(leaf2_intf)
+
+def build_fabric(config: Dict[str, Any], spines: List[str], leafs: List[str]) -> Dict[str, List[Dict]]:
+    """Build fully populated devices: initialize, connect, then assign IPs."""
+    num_leafs = config["num_of_leafs"]
+    devices = initialize_devices(config["num_of_spines"], num_leafs, spines, leafs, config)
+    build_connectivity(devices, num_leafs, config)
+    assign_ips(devices, num_leafs, config)
+    return devices
 
 # Output Manager Functions
+# host_vars interface keys, in the column order of _build_rows after the hostname
+_INTERFACE_KEYS = ("local_port", "remote_host", "remote_port", "local_po", "remote_po", "transit_subnet", "remote_bgp_neighbor")
+
+def _devices_by_host(devices: Dict[str, List[Dict]]) -> Dict[str, Dict]:
+    """Index spine and leaf devices by hostname."""
+    by_host = {d["hostname"]: d for d in devices["spines"]}
+    by_host.update({d["hostname"]: d for d in devices["leafs"]})
+    return by_host
+
+def _build_rows(devices: Dict[str, List[Dict]], spines: List[str]) -> Iterator[Tuple[Any, ...]]:
+    """Yield a connection row for each leaf interface facing a spine or its pair peer."""
+    by_host = _devices_by_host(devices)
+    leaf_hostnames = frozenset(l["hostname"] for l in devices["leafs"])
+    spine_set = frozenset(spines)
+    for leaf in devices["leafs"]:
+        for intf in leaf["interfaces"]:
+            is_spine_link = intf["peer"] in spine_set
+            is_pair_link = intf["peer"] in leaf_hostnames and leaf["pair_id"] is not None
+            if not (is_spine_link or is_pair_link):
+                continue
+            
+            # Find the remote device's loopback IP for remote_bgp_neighbor
+            remote_device = by_host.get(intf["peer"])
+            remote_bgp_neighbor = remote_device["loopback_addr"] if remote_device else "-"
+            
+            yield (
+                leaf["hostname"],
+                intf["port_num"],
+                intf["peer"],
+                intf["peer_port_num"],
+                intf["po_id"],
+                intf["peer_po_id"],
+                intf["transit_subnet"],
+                remote_bgp_neighbor
+            )
+
+def _write_file(item: Tuple[str, str]):
+    """Write content to path for a (path, content) pair."""
+    path, content = item
+    # Raw fd write of the encoded text; skips the TextIOWrapper and its buffer copy
+    data = memoryview(content.encode("utf-8"))
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+    try:
+        while data:
+            data = data[os.write(fd, data):]
+    finally:
+        os.close(fd)
+
+@functools.lru_cache(maxsize=None)
+def _get_jinja_env() -> Environment:
+    """Return the shared Jinja2 environment for host_vars templates."""
+    return Environment(loader=FileSystemLoader("templates"), trim_blocks=True, lstrip_blocks=True,
+                       auto_reload=False, cache_size=400)
+
+@functools.lru_cache(maxsize=8)
+def _get_template(fabric_context: str):
+    """Return the compiled host_vars template for a fabric_context."""
+    return _get_jinja_env().get_template(f"{fabric_context}.j2")
+
 def generate_host_vars(devices: Dict[str, List[Dict]], spines: List[str], fabric_context: str, dry_run: bool = False):
     """Generate host_vars YAML files for spines and leafs using fabric_context Jinja2 template."""
-    env = Environment(loader=FileSystemLoader("templates"), trim_blocks=True, lstrip_blocks=True)
     try:
-        template = env.get_template(f"{fabric_context}.j2")
+        template = _get_template(fabric_context)
     except Exception as e:
         raise ValueError(f"Failed to load template {fabric_context}.j2: {e}")
     
     if not dry_run:
         os.makedirs("output/artifact/host_vars", exist_ok=True)
     
+    host_vars = []
+    leafs_by_host = {d["hostname"]: d for d in devices["leafs"]}
+    
     # Generate host_vars for spines
     for spine in devices["spines"]:
         interfaces = []
         for intf in spine["interfaces"]:
             # Find the remote device's loopback IP for remote_bgp_neighbor
-            remote_device = next(
-                (d for d in devices["leafs"] if d["hostname"] == intf["peer"]),
-                None
-            )
-            remote_bgp_neighbor = remote_device["loopback_ip"].split("/")[0] if remote_device else "-"
+            remote_device = leafs_by_host.get(intf["peer"])
+            remote_bgp_neighbor = remote_device["loopback_addr"] if remote_device else "-"
             
             interfaces.append({
-                "local_port": intf["physical_interface"].replace("Ethernet", ""),
+                "local_port": intf["port_num"],
                 "remote_host": intf["peer"],
-                "remote_port": intf["leaf_physical_interface"].replace("Ethernet", ""),
-                "local_po": intf["name"].replace("Port-Channel", ""),
-                "remote_po": intf["peer_int"].replace("Port-Channel", ""),
+                "remote_port": intf["peer_port_num"],
+                "local_po": intf["po_id"],
+                "remote_po": intf["peer_po_id"],
                 "transit_subnet": intf["transit_subnet"],
                 "remote_bgp_neighbor": remote_bgp_neighbor
             })
@@ -453,46 +641,14 @@ def generate_host_vars(devices: Dict[str, List[Dict]], spines: List[str], fabric
             "interfaces": interfaces,
             "bgp_neighbors": []  # Spines have no BGP neighbors in this setup
         }
-        
-        rendered = template.render(**host_vars_data)
-        if not dry_run:
-            with open(f"output/artifact/host_vars/{spine['hostname']}.yml", "w") as f:
-                f.write(rendered)
-        else:
-            print(f"\nDry run: Would generate output/artifact/host_vars/{spine['hostname']}.yml:")
-            print(rendered)
+        host_vars.append((spine["hostname"], host_vars_data))
     
     # Generate host_vars for leafs
+    rows_by_host: Dict[str, List[Tuple[Any, ...]]] = {}
+    for row in _build_rows(devices, spines):
+        rows_by_host.setdefault(row[0], []).append(row)
     for leaf in devices["leafs"]:
-        interfaces = []
-        for intf in leaf["interfaces"]:
-            # Find the remote device's loopback IP for remote_bgp_neighbor
-            remote_device = next(
-                (d for d in devices["spines"] + devices["leafs"] if d["hostname"] == intf["peer"]),
-                None
-            )
-            remote_bgp_neighbor = remote_device["loopback_ip"].split("/")[0] if remote_device else "-"
-            
-            if intf["peer"] in spines:
-                interfaces.append({
-                    "local_port": intf["physical_interface"].replace("Ethernet", ""),
-                    "remote_host": intf["peer"],
-                    "remote_port": intf["spine_physical_interface"].replace("Ethernet", ""),
-                    "local_po": intf["name"].replace("Port-Channel", ""),
-                    "remote_po": intf["peer_int"].replace("Port-Channel", ""),
-                    "transit_subnet": intf["transit_subnet"],
-                    "remote_bgp_neighbor": remote_bgp_neighbor
-                })
-            elif intf["peer"] in [l["hostname"] for l in devices["leafs"]] and leaf["pair_id"] is not None:
-                interfaces.append({
-                    "local_port": intf["physical_interface"].replace("Ethernet", ""),
-                    "remote_host": intf["peer"],
-                    "remote_port": intf["peer_physical_interface"].replace("Ethernet", ""),
-                    "local_po": intf["name"].replace("Port-Channel", ""),
-                    "remote_po": intf["peer_int"].replace("Port-Channel", ""),
-                    "transit_subnet": intf["transit_subnet"],
-                    "remote_bgp_neighbor": remote_bgp_neighbor
-                })
+        interfaces = [dict(zip(_INTERFACE_KEYS, row[1:])) for row in rows_by_host.get(leaf["hostname"], [])]
         
         host_vars_data = {
             "local_host": leaf["hostname"],
@@ -502,14 +658,22 @@ def generate_host_vars(devices: Dict[str, List[Dict]], spines: List[str], fabric
                 for neighbor in leaf["bgp_neighbors"]
             ]
         }
-        
-        rendered = template.render(**host_vars_data)
-        if not dry_run:
-            with open(f"output/artifact/host_vars/{leaf['hostname']}.yml", "w") as f:
-                f.write(rendered)
-        else:
-            print(f"\nDry run: Would generate output/artifact/host_vars/{leaf['hostname']}.yml:")
-            print(rendered)
+        host_vars.append((leaf["hostname"], host_vars_data))
+    
+    # Keep dry-run output serial so it prints in device order
+    if dry_run:
+        for hostname, host_vars_data in host_vars:
+            print(f"\nDry run: Would generate output/artifact/host_vars/{hostname}.yml:")
+            print(template.render(**host_vars_data))
+        return
+    
+    # Render everything first, then overlap the file writes on a small pool
+    outputs = [
+        (f"output/artifact/host_vars/{hostname}.yml", template.render(**host_vars_data))
+        for hostname, host_vars_data in host_vars
+    ]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(_write_file, outputs))
 
 def generate_inventory(devices: Dict[str, List[Dict]], dry_run: bool = False):
     """Generate Ansible inventory hosts.yml without bgp_asn."""
@@ -519,7 +683,7 @@ def generate_inventory(devices: Dict[str, List[Dict]], dry_run: bool = False):
                 "spines": {
                     "hosts": {
                         spine["hostname"]: {
-                            "ansible_host": spine["loopback_ip"].split("/")[0]
+                            "ansible_host": spine["loopback_addr"]
                         }
                         for spine in devices["spines"]
                     }
@@ -527,7 +691,7 @@ def generate_inventory(devices: Dict[str, List[Dict]], dry_run: bool = False):
                 "leafs": {
                     "hosts": {
                         leaf["hostname"]: {
-                            "ansible_host": leaf["loopback_ip"].split("/")[0]
+                            "ansible_host": leaf["loopback_addr"]
                         }
                         for leaf in devices["leafs"]
                     }
@@ -538,22 +702,23 @@ def generate_inventory(devices: Dict[str, List[Dict]], dry_run: bool = False):
     
     if dry_run:
         print("\nDry run: Would generate output/artifact/hosts.yml:")
-        print(yaml.safe_dump(inventory, sort_keys=False))
+        print(yaml.dump(inventory, Dumper=_Dumper, sort_keys=False))
         return
     
     os.makedirs("output/artifact", exist_ok=True)
     with open("output/artifact/hosts.yml", "w") as f:
-        yaml.safe_dump(inventory, f, sort_keys=False)
+        yaml.dump(inventory, f, Dumper=_Dumper, sort_keys=False)
     print("\nSaved Ansible inventory to output/artifact/hosts.yml")
 
-def generate_ip_assignments_csv(devices: Dict[str, List[Dict]], dry_run: bool = False):
-    """Generate ip_assignments.csv for device and endpoint IP assignments."""
-    headers = ["Device", "Role", "Loopback IP", "Interface", "Transit IP", "Remote Device", "Remote Transit IP", "Transit Subnet"]
-    table = [headers, ["-" * 20, "-" * 10, "-" * 15, "-" * 20, "-" * 15, "-" * 20, "-" * 15, "-" * 15]]
+def _ip_assignment_rows(devices: Dict[str, List[Dict]]) -> Iterator[List[str]]:
+    """Yield ip_assignments.csv rows: headers, separator, then each device and its interfaces."""
+    yield ["Device", "Role", "Loopback IP", "Interface", "Transit IP", "Remote Device", "Remote Transit IP", "Transit Subnet"]
+    yield ["-" * 20, "-" * 10, "-" * 15, "-" * 20, "-" * 15, "-" * 20, "-" * 15, "-" * 15]
     
-    for device in devices["spines"] + devices["leafs"]:
+    by_host = _devices_by_host(devices)
+    for device in chain(devices["spines"], devices["leafs"]):
         # Add a row for the device itself (loopback only, no interface)
-        table.append([
+        yield [
             device["hostname"],
             device["role"],
             device["loopback_ip"],
@@ -562,24 +727,21 @@ def generate_ip_assignments_csv(devices: Dict[str, List[Dict]], dry_run: bool =
             "-",
             "-",
             "-"
-        ])
+        ]
         
         # Add rows for each interface
         for intf in device["interfaces"]:
-            remote_device = next(
-                (d for d in devices["spines"] + devices["leafs"] if d["hostname"] == intf["peer"]),
-                None
-            )
+            remote_device = by_host.get(intf["peer"])
             if not remote_device:
                 continue
             # Find the remote interface's transit IP
             remote_int = next(
-                (ri for ri in remote_device["interfaces"] if ri["peer"] == device["hostname"] and ri["transit_subnet"] == intf["transit_subnet"]),
+                (ri for ri in remote_device["_by_peer"][device["hostname"]] if ri["transit_subnet"] == intf["transit_subnet"]),
                 None
             )
             remote_transit_ip = remote_int["ip"] if remote_int else "-"
             
-            table.append([
+            yield [
                 device["hostname"],
                 device["role"],
                 device["loopback_ip"],
@@ -588,171 +750,142 @@ def generate_ip_assignments_csv(devices: Dict[str, List[Dict]], dry_run: bool =
                 intf["peer"],
                 remote_transit_ip,
                 intf.get("transit_subnet", "-")
-            ])
-    
+            ]
+
+def generate_ip_assignments_csv(devices: Dict[str, List[Dict]], dry_run: bool = False):
+    """Generate ip_assignments.csv for device and endpoint IP assignments."""
     if dry_run:
         print("\nDry run: Would generate output/artifact/ip_assignments.csv with the following content:")
-        for row in table:
-            print(f"{','.join(row)}")
+        sys.stdout.writelines(",".join(row) + "\n" for row in _ip_assignment_rows(devices))
         return
     
     os.makedirs("output/artifact", exist_ok=True)
-    with open("output/artifact/ip_assignments.csv", "w", newline="") as f:
+    with open("output/artifact/ip_assignments.csv", "w", newline="", buffering=_CSV_BUFFER_SIZE) as f:
         writer = csv.writer(f)
-        writer.writerows(table)
+        writer.writerows(_ip_assignment_rows(devices))
     print("\nSaved IP assignments to output/artifact/ip_assignments.csv")
 
-def display_table(devices: Dict[str, List[Dict]], spines: List[str]) -> List[List[str]]:
+def display_table(devices: Dict[str, List[Dict]], spines: List[str]) -> List[Sequence[Any]]:
     """Display IP and port connections in a table and return table data."""
     headers = ["Host", "Local Port", "Remote Host", "Remote Port", "Local PO", "Remote PO", "Transit Subnet", "Remote BGP Neighbor"]
     table = [headers, ["-" * 20, "-" * 12, "-" * 20, "-" * 12, "-" * 10, "-" * 10, "-" * 15, "-" * 20]]
     
-    for leaf in devices["leafs"]:
-        for intf in leaf["interfaces"]:
-            # Find the remote device's loopback IP for remote_bgp_neighbor
-            remote_device = next(
-                (d for d in devices["spines"] + devices["leafs"] if d["hostname"] == intf["peer"]),
-                None
-            )
-            remote_bgp_neighbor = remote_device["loopback_ip"].split("/")[0] if remote_device else "-"
-            
-            if intf["peer"] in spines:
-                row = [
-                    leaf["hostname"],
-                    intf["physical_interface"].replace("Ethernet", ""),
-                    intf["peer"],
-                    intf["spine_physical_interface"].replace("Ethernet", ""),
-                    intf["name"].replace("Port-Channel", ""),
-                    intf["peer_int"].replace("Port-Channel", ""),
-                    intf["transit_subnet"],
-                    remote_bgp_neighbor
-                ]
-                table.append(row)
-            elif intf["peer"] in [l["hostname"] for l in devices["leafs"]] and leaf["pair_id"] is not None:
-                row = [
-                    leaf["hostname"],
-                    intf["physical_interface"].replace("Ethernet", ""),
-                    intf["peer"],
-                    intf["peer_physical_interface"].replace("Ethernet", ""),
-                    intf["name"].replace("Port-Channel", ""),
-                    intf["peer_int"].replace("Port-Channel", ""),
-                    intf["transit_subnet"],
-                    remote_bgp_neighbor
-                ]
-                table.append(row)
+    table.extend(_build_rows(devices, spines))
     
     print("\nIP and Port Connections Table:")
-    for row in table:
-        print(f"{row[0]:<20} | {row[1]:<12} | {row[2]:<20} | {row[3]:<12} | {row[4]:<10} | {row[5]:<10} | {row[6]:<15} | {row[7]:<20}")
+    sys.stdout.write("\n".join(_ROW_FMT.format(*row) for row in table) + "\n")
     
     return table
 
-def save_table_csv(table: List[List[str]], dry_run: bool = False):
+def save_table_csv(table: List[Sequence[Any]], dry_run: bool = False):
     """Save table to connections.csv."""
     if dry_run:
         print("\nDry run: Would generate output/artifact/connections.csv with the following content:")
-        for row in table:
-            print(f"{','.join(row)}")
+        sys.stdout.write("\n".join(",".join(map(str, row)) for row in table) + "\n")
         return
     
     os.makedirs("output/artifact", exist_ok=True)
-    with open("output/artifact/connections.csv", "w", newline="") as f:
+    with open("output/artifact/connections.csv", "w", newline="", buffering=_CSV_BUFFER_SIZE) as f:
         writer = csv.writer(f)
         writer.writerows(table)
     print("\nSaved table to output/artifact/connections.csv")
 
 # Main Script
 def get_user_input(input_path: Optional[str] = None) -> tuple[Dict[str, Any], List[str], List[str]]:
-    """Get user input interactively or from input.yml."""
+    """Get user input from input.yml, prompting only for values neither it nor fabric.yml provides."""
+    input_config = {}
     if input_path:
         try:
-            config = read_config("config/fabric.yml", input_path)
-            # Required inputs must be present in input.yml or will prompt
-            required_inputs = ["num_of_spines", "num_of_leafs", "spine_hostnames", "leaf_hostnames", "fabric_context"]
-            for key in required_inputs:
-                if key not in config:
-                    raise ValueError(f"Missing required input: {key}")
-            spines = parse_hostname_range(config["spine_hostnames"])
-            leafs = parse_hostname_range(config["leaf_hostnames"])
-            # Parse port ranges from input.yml if provided
-            if "spine_port_channel_range" in config:
-                config["spine_port_channel_range"] = parse_flexible_range(config["spine_port_channel_range"])
-            if "spine_ports_range" in config:
-                config["spine_ports_range"] = parse_flexible_range(config["spine_ports_range"])
-            return config, spines, leafs
+            input_config = _read_yaml(input_path, "input configuration")
         except (FileNotFoundError, ValueError) as e:
             print(f"Error reading input.yml: {e}")
             print("Falling back to interactive input.")
+    interactive = not input_config
+    
+    # fabric_context selects the fabric.yml section, so resolve it before anything else
+    if "fabric_context" not in input_config:
+        input_config["fabric_context"] = input("Enter fabric context (e.g., seti_oob_access): ")
+    # Hand the already-parsed input.yml values to read_config instead of its path;
+    # read_config merges them over the fabric.yml section and validates what is present
+    config = read_config("config/fabric.yml", user_inputs=input_config)
+    
+    # Required inputs: prompt only for the ones neither input.yml nor fabric.yml provides
+    user_inputs = {}
+    if "num_of_spines" not in config:
+        user_inputs["num_of_spines"] = int(input("Enter number of spines: "))
+    if "num_of_leafs" not in config:
+        user_inputs["num_of_leafs"] = int(input("Enter number of leafs: "))
+    if "spine_hostnames" not in config:
+        user_inputs["spine_hostnames"] = input("Enter spine hostnames (e.g., nj01pdmr[101-102]): ")
+    if "leaf_hostnames" not in config:
+        user_inputs["leaf_hostnames"] = input("Enter leaf hostnames (e.g., nj01pamr[101-106]): ")
+    
+    # Optional inputs are only prompted for when there is no input.yml to read them from
+    if interactive:
+        transit = input("Enter transit network (e.g., 10.10.10.0/24) [optional, press Enter to skip]: ")
+        if transit:
+            user_inputs["transit"] = transit
+        
+        loopback = input("Enter loopback network (e.g., 10.10.20.0/24) [optional, press Enter to skip]: ")
+        if loopback:
+            user_inputs["loopback"] = loopback
+        
+        bgp_asn = input("Enter BGP ASN (e.g., 65201) [optional, press Enter to skip]: ")
+        if bgp_asn:
+            user_inputs["bgp_asn"] = int(bgp_asn)
+        
+        spine_port_channel_range = input("Enter spine port channel range (e.g., [1,3,5-10]) [optional, press Enter to skip]: ")
+        if spine_port_channel_range:
+            user_inputs["spine_port_channel_range"] = spine_port_channel_range
+        
+        spine_ports_range = input("Enter spine ports range (e.g., [1-4,7,9-12]) [optional, press Enter to skip]: ")
+        if spine_ports_range:
+            user_inputs["spine_ports_range"] = spine_ports_range
     
-    # Interactive input
-    config = {}
-    
-    fabric_context = input("Enter fabric context (e.g., seti_oob_access): ")
-    config["fabric_context"] = fabric_context
-    config = read_config("config/fabric.yml", user_inputs=config)
-    
-    num_spines = int(input("Enter number of spines: "))
-    num_leafs = int(input("Enter number of leafs: "))
-    spine_hostnames = input("Enter spine hostnames (e.g., nj01pdmr[101-102]): ")
-    leaf_hostnames = input("Enter leaf hostnames (e.g., nj01pamr[101-106]): ")
-    
-    spines = parse_hostname_range(spine_hostnames)
-    leafs = parse_hostname_range(leaf_hostnames)
-    
-    config.update({
-        "num_of_spines": num_spines,
-        "num_of_leafs": num_leafs,
-        "spine_hostnames": spine_hostnames,
-        "leaf_hostnames": leaf_hostnames
-    })
-    
-    # Optional inputs
-    transit = input("Enter transit network (e.g., 10.10.10.0/24) [optional, press Enter to skip]: ")
-    if transit:
-        config["transit"] = transit
-    
-    loopback = input("Enter loopback network (e.g., 10.10.20.0/24) [optional, press Enter to skip]: ")
-    if loopback:
-        config["loopback"] = loopback
-    
-    bgp_asn = input("Enter BGP ASN (e.g., 65201) [optional, press Enter to skip]: ")
-    if bgp_asn:
-        config["bgp_asn"] = int(bgp_asn)
-    
-    spine_port_channel_range = input("Enter spine port channel range (e.g., [1,3,5-10]) [optional, press Enter to skip]: ")
-    if spine_port_channel_range:
-        config["spine_port_channel_range"] = parse_flexible_range(spine_port_channel_range)
-    
-    spine_ports_range = input("Enter spine ports range (e.g., [1-4,7,9-12]) [optional, press Enter to skip]: ")
-    if spine_ports_range:
-        config["spine_ports_range"] = parse_flexible_range(spine_ports_range)
-    
+    # Prompted values can change cross-key checks (e.g. ports per leaf), so validate again
+    if user_inputs:
+        config.update(user_inputs)
+        _validate_config(config)
+    spines = parse_hostname_range(config["spine_hostnames"])
+    leafs = parse_hostname_range(config["leaf_hostnames"])
     return config, spines, leafs
 
+# Built once at import so repeated main() calls reuse it
+_PARSER = argparse.ArgumentParser(description="Generate fabric configuration.")
+_PARSER.add_argument("--input", help="Path to input.yml file", default="config/input.yml")
+_PARSER.add_argument("--dry-run", action="store_true", help="Perform a dry run without writing files")
+
 def main():
     """Main function."""
-    parser = argparse.ArgumentParser(description="Generate fabric configuration.")
-    parser.add_argument("--input", help="Path to input.yml file", default="config/input.yml")
-    parser.add_argument("--dry-run", action="store_true", help="Perform a dry run without writing files")
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
     
     try:
         config, spines, leafs = get_user_input(args.input)
         validate_input(config["num_of_spines"], config["num_of_leafs"], spines, leafs, config)
         
-        devices = initialize_devices(config["num_of_spines"], config["num_of_leafs"], spines, leafs, config)
-        build_connectivity(devices, config["num_of_leafs"], config)
-        assign_ips(devices, config["num_of_leafs"], config)
+        devices = build_fabric(config, spines, leafs)
         
         table = display_table(devices, spines)
-        save_table_csv(table, args.dry_run)
-        generate_host_vars(devices, spines, config["fabric_context"], args.dry_run)
-        generate_inventory(devices, args.dry_run)
-        generate_ip_assignments_csv(devices, args.dry_run)
+        writers = [
+            (save_table_csv, (table, args.dry_run)),
+            (generate_host_vars, (devices, spines, config["fabric_context"], args.dry_run)),
+            (generate_inventory, (devices, args.dry_run)),
+            (generate_ip_assignments_csv, (devices, args.dry_run)),
+        ]
+        if args.dry_run:
+            # Previews go to stdout, so keep them in order
+            for writer, writer_args in writers:
+                writer(*writer_args)
+        else:
+            # The outputs are independent files, so overlap their writes
+            with ThreadPoolExecutor(max_workers=len(writers)) as executor:
+                futures = [executor.submit(writer, *writer_args) for writer, writer_args in writers]
+                for future in futures:
+                    future.result()
         
     except (ValueError, FileNotFoundError) as e:
         print(f"Error: {e}")
-        exit(1)
+        sys.exit(1)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file